@@ -1,3 +1,5 @@
+import os
+
 from flask import Flask
 from config import Config
 from extensions import db, login_manager
@@ -22,4 +24,5 @@ def create_app():
 app = create_app()
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    # reloader + debugger only when explicitly asked for (FLASK_DEBUG=1)
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1")
\ No newline at end of file
@@ -1,19 +1,35 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_user, logout_user, login_required
+from sqlalchemy import select, func
 from extensions import db
 from models.user import User
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
 
+def _normalize_email(email: str | None) -> str | None:
+    # the one form emails are stored and looked up in
+    return email.strip().lower() if email else email
+
+
+def _find_user_by_email(email: str | None) -> User | None:
+    # Single indexed probe (ix_user_email_lower) instead of a Query object per call;
+    # callers pass the normalized email
+    if not email:
+        return None
+    return db.session.execute(
+        select(User).where(func.lower(User.email) == email)
+    ).scalar_one_or_none()
+
+
 @auth_bp.route("/register", methods=["GET", "POST"])
 def register():
     if request.method == "POST":
-        email = request.form.get("email")
+        email = _normalize_email(request.form.get("email"))
         password = request.form.get("password")
 
         # check if user already exists
-        existing = User.query.filter_by(email=email).first()
+        existing = _find_user_by_email(email)
         if existing:
             flash("Email already exists.")
             return redirect(url_for("auth.register"))
@@ -34,12 +50,15 @@ def register():
 @auth_bp.route("/login", methods=["GET", "POST"])
 def login():
     if request.method == "POST":
-        email = request.form.get("email")
+        email = _normalize_email(request.form.get("email"))
         password = request.form.get("password")
 
-        user = User.query.filter_by(email=email).first()
+        user = _find_user_by_email(email)
 
         if user and user.check_password(password):
+            if user.needs_rehash():
+                user.set_password(password)
+                db.session.commit()
             login_user(user)
             return redirect(url_for("main.dashboard"))
 
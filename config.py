@@ -15,6 +15,12 @@ class Config:
     SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(instance_dir, "app.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # SQLite connection tuning (journal/cache pragmas are applied in extensions.py on connect)
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "connect_args": {"check_same_thread": False, "timeout": 30},
+        "pool_pre_ping": True,
+    }
+
     # Canonical course catalog (CSV + xlsx files). Put your uploaded files in this folder.
     CATALOG_DIR = os.path.join(basedir, "data_catalog") 
     
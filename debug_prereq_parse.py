@@ -2,10 +2,8 @@ from config import Config
 from utils.course_catalog import load_catalog, build_resolver
 from utils.external_rules import load_external_rules
 from utils.alias_rules import load_aliases_csv
-from utils.req_parser import parse_req_text
-from collections import Counter
-
-from services.req_ir import ReqLeaf, ReqAnd, ReqOr
+from utils.req_parser import parse_catalog_prereqs
+from collections import defaultdict
 
 
 if __name__ == "__main__":
@@ -18,58 +16,59 @@ if __name__ == "__main__":
     resolve = build_resolver(catalog, external_rules=ext_rules, alias_rules=alias_rules)
 
     parsed = 0
-    external_tokens = Counter()
-    unresolved_tokens = Counter()
+    # token -> [count, example "COURSECODE - coursename"] (one hash probe per leaf)
+    external_tokens = defaultdict(lambda: [0, ""])
+    unresolved_tokens = defaultdict(lambda: [0, ""])
 
-    external_examples = {}  
-    unresolved_examples = {}   # token -> example "COURSECODE - coursename"
+    # parsed once per distinct prereq_text (catalogs repeat the same strings a lot)
+    trees_by_text = parse_catalog_prereqs(catalog, resolve)
 
     for c in catalog:
         if not getattr(c, "prereq_text", None):
             continue
 
-        tree = parse_req_text(c.prereq_text, resolve)
+        tree = trees_by_text[c.prereq_text]
         parsed += 1
 
-        # count leaf classifications
-        def walk(node):
+        # count leaf classifications (explicit stack, no recursion per node)
+        stack = [tree]
+        while stack:
+            node = stack.pop()
             if node is None:
-                return
-            
-            if isinstance(node, ReqLeaf):
+                continue
+
+            if node.IS_LEAF:
                 if node.code is None:
                     tok = (node.raw or "").strip()
                     if not tok:
-                        return
+                        continue
                     if node.kind == "external":
-                        external_tokens[tok] +=1
-                        external_examples.setdefault(tok, f"{c.code} - {c.name}")
+                        entry = external_tokens[tok]
                     elif node.kind == "unresolved":
-                        unresolved_tokens[tok] += 1
-                        unresolved_examples.setdefault(tok, f"{c.code} - {c.name}")
-                return
+                        entry = unresolved_tokens[tok]
+                    else:
+                        continue
+                    entry[0] += 1
+                    if not entry[1]:
+                        entry[1] = f"{c.code} - {c.name}"
+                continue
 
-            if isinstance(node, (ReqAnd, ReqOr)):
-                for child in node.items:
-                    walk(child)
-        walk(tree)
+            stack.extend(node.items)
 
 DEBUG = False
 
 if DEBUG:
     print("Courses with prereq_text parsed:", parsed)
-    print("External prereq tokens:", sum(external_tokens.values()))
-    print("Unresolved prereq tokens:", sum(unresolved_tokens.values()))
+    print("External prereq tokens:", sum(cnt for cnt, _ in external_tokens.values()))
+    print("Unresolved prereq tokens:", sum(cnt for cnt, _ in unresolved_tokens.values()))
     print("ALIASES PATH:", Config.ALIASES_CSV_PATH)
     print("ALIASES LOADED:", alias_rules.alias_to_canonical)
 
     print("\nTop external tokens:")
-    for tok, cnt in external_tokens.most_common(20):
-        example = external_examples.get(tok, "")
+    for tok, (cnt, example) in sorted(external_tokens.items(), key=lambda kv: -kv[1][0])[:20]:
         print(f"{cnt:>3} x {tok}   (e.g. {example})")
 
     print("\nTop unresolved tokens:")
-    for tok, cnt in unresolved_tokens.most_common(20):
-        example = unresolved_examples.get(tok, "")
+    for tok, (cnt, example) in sorted(unresolved_tokens.items(), key=lambda kv: -kv[1][0])[:20]:
         print(f"{cnt:>3} x {tok}   (e.g. {example})")
 
@@ -1,12 +1,34 @@
+import sqlite3
+
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 db = SQLAlchemy()
 login_manager = LoginManager()
 login_manager.login_view = "auth.login"
 login_manager.session_protection = "strong"
 
+
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL: readers don't block the writer; mmap + bigger page cache for catalog-heavy reads
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    # SQLite ignores ON DELETE CASCADE unless FK enforcement is switched on per connection
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")   # 256MB
+    cursor.execute("PRAGMA cache_size=-65536")     # 64MB
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
 @login_manager.user_loader
 def load_user(user_id):
     from models.user import User
-    return User.query.get(int(user_id))
+    # identity-map aware PK lookup (no query if already loaded in this session)
+    return db.session.get(User, int(user_id))
@@ -1,3 +1,7 @@
+from collections import defaultdict
+
+from sqlalchemy import inspect
+
 from app import app
 from extensions import db
 
@@ -6,11 +10,98 @@ from models.user import User
 from models.degree_plan import DegreePlan
 from models.course import Course
 from models.prerequisite import Prerequisite
-from models.course_offering import CourseOffering
 from models.plan_constraint import PlanConstraint
+from models.plan_solution import PlanSolution
+
+
+def migrate_offerings_to_mask():
+    """
+    One-off for databases created before offerings moved from the course_offering
+    table onto course.offered_semesters_mask: add the column, fold the rows into it,
+    drop the old table. No-op on fresh databases.
+    """
+    insp = inspect(db.engine)
+    if "course_offering" not in insp.get_table_names():
+        return
+    if "offered_semesters_mask" not in {c["name"] for c in insp.get_columns("course")}:
+        db.session.execute(db.text(
+            "ALTER TABLE course ADD COLUMN offered_semesters_mask INTEGER NOT NULL DEFAULT 0"
+        ))
+    db.session.execute(db.text(
+        "UPDATE course SET offered_semesters_mask = COALESCE(("
+        " SELECT SUM(DISTINCT 1 << (o.semester_number - 1)) FROM course_offering o"
+        " WHERE o.course_id = course.id AND o.semester_number BETWEEN 1 AND 62"
+        "), 0)"
+    ))
+    db.session.execute(db.text("DROP TABLE course_offering"))
+    db.session.commit()
+    print("Migrated course_offering rows into course.offered_semesters_mask")
+
+
+def migrate_user_emails():
+    """
+    One-off for databases created before emails were stored trimmed + lowercased:
+    normalize the stored emails and create ix_user_email_lower (create_all doesn't add
+    indexes to an existing table). Accounts whose emails differ only in case/whitespace
+    belong to different people as far as we know, so they're listed and the script
+    stops; resolve them by hand and run it again. No-op once clean.
+    """
+    rows = db.session.execute(db.text('SELECT id, email FROM "user" ORDER BY id')).all()
+
+    by_normalized = defaultdict(list)  # normalized email -> [(id, stored email), ...]
+    for user_id, email in rows:
+        by_normalized[email.strip().lower()].append((user_id, email))
+
+    collisions = {n: users for n, users in by_normalized.items() if len(users) > 1}
+    if collisions:
+        lines = [
+            f"  {n}: " + ", ".join(f"id={user_id} {email!r}" for user_id, email in users)
+            for n, users in sorted(collisions.items())
+        ]
+        raise SystemExit(
+            "User emails that differ only in case/whitespace; rename or remove all but one"
+            " of each group, then run init_db.py again:\n" + "\n".join(lines)
+        )
+
+    renamed = 0
+    for normalized, [(user_id, email)] in by_normalized.items():
+        if email != normalized:
+            db.session.execute(
+                db.text('UPDATE "user" SET email = :email WHERE id = :id'),
+                {"email": normalized, "id": user_id},
+            )
+            renamed += 1
+
+    db.session.execute(db.text(
+        'CREATE UNIQUE INDEX IF NOT EXISTS ix_user_email_lower ON "user" (lower(email))'
+    ))
+    db.session.commit()
+    if renamed:
+        print(f"Normalized {renamed} user email(s)")
+
+
+def create_missing_indexes():
+    """
+    create_all() only adds indexes along with new tables; databases created before
+    these indexes existed get them here (IF NOT EXISTS, so a no-op afterwards).
+    """
+    db.session.execute(db.text(
+        "CREATE INDEX IF NOT EXISTS ix_prereq_prereq_course"
+        " ON prerequisite (prereq_course_id, degree_plan_id)"
+    ))
+    db.session.execute(db.text(
+        "CREATE INDEX IF NOT EXISTS ix_degree_plan_user_name ON degree_plan (user_id, name)"
+    ))
+    db.session.commit()
 
 
 with app.app_context():
     print("DB URI:", app.config["SQLALCHEMY_DATABASE_URI"])
     db.create_all()
+    migrate_offerings_to_mask()
+    migrate_user_emails()
+    create_missing_indexes()
+    # refresh planner statistics so SQLite actually picks the composite indexes
+    db.session.execute(db.text("ANALYZE"))
+    db.session.commit()
     print("DB CREATED")
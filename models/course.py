@@ -1,6 +1,10 @@
 from extensions import db
 
 
+# Highest semester number the offerings bitmask can hold
+MAX_SEMESTER = 62
+
+
 class Course(db.Model):
     __tablename__ = "course"
 
@@ -25,15 +29,12 @@ class Course(db.Model):
     credits = db.Column(db.Integer, nullable=False)
     difficulty = db.Column(db.Integer, nullable=True)
 
+    # Semesters this course is offered in, as a bitmask: bit (s - 1) set <=> offered in semester s.
+    # One int on the course row instead of a row per semester in a child table.
+    offered_semesters_mask = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     plan = db.relationship("DegreePlan", back_populates="courses", lazy=True)
 
-    offerings = db.relationship(
-        "CourseOffering",
-        back_populates="course",
-        cascade="all, delete-orphan",
-        passive_deletes=True,
-        lazy=True,
-    )
 
     # Prereq edges where THIS course is the dependent course (X requires Y)
     prereq_edges = db.relationship(
@@ -55,5 +56,19 @@ class Course(db.Model):
         lazy=True,
     )
 
+    @property
+    def offered_semesters(self) -> list[int]:
+        mask = self.offered_semesters_mask or 0
+        return [i + 1 for i in range(mask.bit_length()) if mask >> i & 1]
+
+    @offered_semesters.setter
+    def offered_semesters(self, semesters) -> None:
+        # out-of-range numbers are dropped (SQLite INTEGER is signed 64-bit)
+        mask = 0
+        for s in semesters:
+            if 1 <= s <= MAX_SEMESTER:
+                mask |= 1 << (s - 1)
+        self.offered_semesters_mask = mask
+
     def __repr__(self) -> str:
         return f"<Course {self.code}>"
@@ -5,6 +5,11 @@ from extensions import db
 class DegreePlan(db.Model):
     __tablename__ = "degree_plan"
 
+    __table_args__ = (
+        # Dashboard listing + duplicate-name check both filter by user (and name)
+        db.Index("ix_degree_plan_user_name", "user_id", "name"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(
         db.Integer,
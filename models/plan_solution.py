@@ -0,0 +1,28 @@
+from datetime import datetime
+from extensions import db
+
+
+# Last proven solver result (Optimal / Infeasible) for a plan,
+# reused while the solver inputs are unchanged
+class PlanSolution(db.Model):
+    __tablename__ = "plan_solution"
+
+    # one row per plan: a new solve with different inputs replaces it
+    degree_plan_id = db.Column(
+        db.Integer,
+        db.ForeignKey("degree_plan.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # services.solver.inputs_digest(...) of the inputs + flags this result was solved for
+    inputs_hash = db.Column(db.String(32), nullable=False)
+
+    status = db.Column(db.String(32), nullable=False)
+
+    # {course_code: chosen semester}; empty unless status is "Optimal" or "Feasible"
+    chosen = db.Column(db.JSON, nullable=False)
+
+    solved_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<PlanSolution plan={self.degree_plan_id} {self.status}>"
@@ -13,6 +13,9 @@ class Prerequisite(db.Model):
             "prereq_course_id",
             name="uq_prereq_plan_course_prereq",
         ),
+        # The unique constraint above already covers (degree_plan_id, course_id) lookups.
+        # Reverse direction: "which courses depend on Y" + FK cascade from course.id
+        db.Index("ix_prereq_prereq_course", "prereq_course_id", "degree_plan_id"),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -1,8 +1,59 @@
+import hashlib
+import hmac
+import os
+import threading
+from collections import OrderedDict
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from sqlalchemy import func
 from extensions import db
 
 
+# Argon2id (argon2-cffi, C implementation). One configured hasher shared by the module.
+_ph = PasswordHasher(time_cost=3, memory_cost=64 * 1024, parallelism=1)
+
+
+def _check_hash(password_hash: str, password: str) -> bool:
+    if password_hash.startswith("$argon2"):
+        try:
+            return _ph.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    # legacy Werkzeug hashes (pbkdf2:/scrypt:) until they're upgraded on login
+    return check_password_hash(password_hash, password)
+
+
+# Bounded LRU of successful verifications: (password_hash, keyed digest) -> True.
+# Keyed on the salted hash, so a password change never hits a stale entry.
+# The per-process HMAC key keeps plaintext (and crackable digests) out of memory.
+# Shared by request threads, hence the lock (never held while hashing).
+_VERIFY_CACHE_MAX = 4096
+_VERIFY_CACHE_KEY = os.urandom(32)
+_verified: OrderedDict[tuple[str, bytes], bool] = OrderedDict()
+_verified_lock = threading.Lock()
+
+
+def _verify(password_hash: str, password: str) -> bool:
+    digest = hmac.new(_VERIFY_CACHE_KEY, password.encode("utf-8"), hashlib.sha256).digest()
+    key = (password_hash, digest)
+    with _verified_lock:
+        if key in _verified:
+            _verified.move_to_end(key)
+            return True
+
+    ok = _check_hash(password_hash, password)
+    if ok:
+        # only successes are cached, failed guesses always pay the full hash cost
+        with _verified_lock:
+            _verified[key] = True
+            if len(_verified) > _VERIFY_CACHE_MAX:
+                _verified.popitem(last=False)
+    return ok
+
+
 class User(UserMixin, db.Model):
     __tablename__ = "user"
 
@@ -10,6 +61,11 @@ class User(UserMixin, db.Model):
     email = db.Column(db.String(150), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
 
+    __table_args__ = (
+        # Case-insensitive email lookups (login/register) hit this index instead of scanning
+        db.Index("ix_user_email_lower", func.lower(email), unique=True),
+    )
+
     # relationship (explicit instead of backref)
     degree_plans = db.relationship(
         "DegreePlan",
@@ -19,15 +75,17 @@ class User(UserMixin, db.Model):
     )
 
     def set_password(self, password: str) -> None:
-        # use PBKDF2 instead of the default scrypt
-        self.password_hash = generate_password_hash(
-            password,
-            method="pbkdf2:sha256",
-            salt_length=16,
-        )
+        self.password_hash = _ph.hash(password)
+
+    def needs_rehash(self) -> bool:
+        # legacy Werkzeug hashes, or Argon2 hashes with outdated parameters,
+        # get upgraded on the next successful login
+        if not self.password_hash.startswith("$argon2"):
+            return True
+        return _ph.check_needs_rehash(self.password_hash)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return _verify(self.password_hash, password)
 
     def __repr__(self) -> str:
         return f"<User {self.email}>"
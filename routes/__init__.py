@@ -1,8 +1,26 @@
-from flask import Blueprint
+from flask import Blueprint, request
 
 # single main blueprint for everything except auth(has its own)
 main_bp = Blueprint("main", __name__)
 
+# Success notices travel as ?notice=<key> on the redirect instead of flash(),
+# so a successful POST doesn't have to re-sign and re-send the session cookie.
+# Errors still use flash().
+NOTICES = {
+    "course_added": "Course added.",
+    "course_updated": "Course updated.",
+    "course_deleted": "Course deleted.",
+    "offerings_updated": "Offerings updated.",
+    "prereq_added": "Prerequisite added.",
+    "prereq_removed": "Prerequisite removed.",
+}
+
+
+@main_bp.app_context_processor
+def inject_notice():
+    return {"notice": NOTICES.get(request.args.get("notice", ""))}
+
+
 #  import route modules (we'll create them later, hense the # noqa: F401)
 from . import plans      # noqa: F401
 from . import courses    # noqa: F401
@@ -1,95 +1,85 @@
 from flask import render_template, redirect, url_for, request, abort, flash, current_app
 from flask_login import login_required, current_user
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, raiseload
 
 from . import main_bp
+from .plans import owned_plan, render_plan_detail
 from models.degree_plan import DegreePlan
 from models.course import Course
-from models.course_offering import CourseOffering
 from models.prerequisite import Prerequisite
-from models.plan_constraint import PlanConstraint
 from extensions import db
 from utils.semesters import format_semester_label
 from utils.course_catalog import load_catalog
+from utils.forms import form_fields, parse_credits, parse_difficulty
+
+
+def _n1_guard():
+    """
+    Loader options that make any lazy relationship SELECT raise in debug mode,
+    so N+1 regressions in these routes fail loudly in dev instead of silently in prod.
+    sql_only: lookups that the identity map can answer (edge.course etc.) are still allowed.
+    """
+    if current_app.debug:
+        return (raiseload("*", sql_only=True),)
+    return ()
+
+
+def _load_plan_and_course(plan_id: int, course_id: int, *options):
+    """
+    Load the plan (owned by current_user) and the course (inside that plan)
+    with one SELECT ... JOIN instead of two lookups. 404 if either doesn't match.
+    """
+    row = db.session.execute(
+        select(DegreePlan, Course)
+        .join(Course, Course.degree_plan_id == DegreePlan.id)
+        .where(
+            DegreePlan.id == plan_id,
+            DegreePlan.user_id == current_user.id,
+            Course.id == course_id,
+        )
+        .options(*options)
+    ).first()
+    if row is None:
+        abort(404)
+    return row[0], row[1]
+
 
 @main_bp.route("/plans/<int:plan_id>/courses/add", methods=["POST"])
 @login_required
 def add_course(plan_id: int):
     # 1) Ensure plan belongs to current user
-    plan = DegreePlan.query.filter_by(
-        id=plan_id,
-        user_id=current_user.id,
-    ).first()
-    if plan is None:
-        abort(404)
+    plan = owned_plan(plan_id)
 
     # 2) Optional: override fields from catalog selection
-    pick = (request.form.get("catalog_pick") or "").strip()
-    if pick:
-        parts = pick.split("||")
-        if len(parts) == 3:
-            code = parts[0].strip()
-            name = parts[1].strip()
-            credits_raw = parts[2].strip()
-        else:
-            code = (request.form.get("code") or "").strip()
-            name = (request.form.get("name") or "").strip()
-            credits_raw = (request.form.get("credits") or "").strip()
+    # Format is "code||name||credits"; anything else falls back to the typed fields
+    form = request.form
+    pick, difficulty_raw = form_fields(form, "catalog_pick", "difficulty")
+    parts = pick.split("||", 2) if pick else None
+    if parts is not None and len(parts) == 3 and "||" not in parts[2]:
+        code, name, credits_raw = (p.strip() for p in parts)
     else:
-        code = (request.form.get("code") or "").strip()
-        name = (request.form.get("name") or "").strip()
-        credits_raw = (request.form.get("credits") or "").strip()
-
-    difficulty_raw = (request.form.get("difficulty") or "").strip()
+        code, name, credits_raw = form_fields(form, "code", "name", "credits")
 
     if not code or not name:
-        flash("Course code and name are required.", "error")
-        return redirect(url_for("main.view_plan", plan_id=plan.id))
-
-    # 3) Credit validation (must happen BEFORE duplicate check, because we need credits_val)
-    if not credits_raw:
-        flash("Credits are required.", "error")
-        return redirect(url_for("main.view_plan", plan_id=plan.id))
-
-    try:
-        credits_val = float(credits_raw)
-    except ValueError:
-        flash("Credits must be a number.", "error")
-        return redirect(url_for("main.view_plan", plan_id=plan.id))
-
-    if credits_val <= 0:
-        flash("Credits must be positive.", "error")
-        return redirect(url_for("main.view_plan", plan_id=plan.id))
-
-    if not (credits_val * 2).is_integer():
-        flash("Credits must be an integer OR end with .5", "error")
-        return redirect(url_for("main.view_plan", plan_id=plan.id))
-
-    # 4) Duplicate check: Duplicate check: enforce uniqueness by course CODE within the plan
-    existing = Course.query.filter_by(
-        degree_plan_id=plan.id,
-        code=code,
-    ).first()
-    if existing:
-        flash(f"Course {code} already exists in this plan.", "error")
-        return redirect(url_for("main.view_plan", plan_id=plan.id))
-
-
-    # 5) Difficulty (optional)
-    difficulty = None
-    if difficulty_raw:
-        try:
-            diff_val = int(difficulty_raw)
-        except ValueError:
-            flash("Difficulty must be a number between 1 and 5.", "error")
-            return redirect(url_for("main.view_plan", plan_id=plan.id))
-
-        if diff_val < 1 or diff_val > 5:
-            flash("Difficulty must be between 1 and 5.", "error")
-            return redirect(url_for("main.view_plan", plan_id=plan.id))
-
-        difficulty = diff_val
-
-    # 6) Create and save the course
+        return render_plan_detail(
+            plan, form=form, errors=["Course code and name are required."]
+        ), 400
+
+    # 3) Credits
+    credits_val, err = parse_credits(credits_raw)
+    if err:
+        return render_plan_detail(plan, form=form, errors=[err]), 400
+
+    # 4) Difficulty (optional)
+    difficulty, err = parse_difficulty(difficulty_raw)
+    if err:
+        return render_plan_detail(plan, form=form, errors=[err]), 400
+
+    # 5) Create and save the course.
+    # Duplicate codes are rejected by uq_course_plan_code in the same round trip as the
+    # INSERT, instead of a separate SELECT before it.
     course = Course(
         degree_plan_id=plan.id,
         code=code,
@@ -98,90 +88,61 @@ def add_course(plan_id: int):
         difficulty=difficulty,
     )
     db.session.add(course)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return render_plan_detail(plan, form=form, errors=[f"Course {code} already exists in this plan."]), 400
 
-    flash("Course added.", "success")
-    return redirect(url_for("main.view_plan", plan_id=plan.id))
+    return redirect(url_for("main.view_plan", plan_id=plan.id, notice="course_added"), code=303)
+
+
+def _render_edit_form(plan: DegreePlan, course: Course, error: str):
+    # re-render the form with what the user typed (no redirect + second lookup round trip)
+    return render_template(
+        "edit_course.html", plan=plan, course=course, form=request.form, errors=[error]
+    ), 400
 
 
 @main_bp.route("/plans/<int:plan_id>/courses/<int:course_id>/edit", methods=["GET", "POST"])
 @login_required
 def edit_course(plan_id: int, course_id: int):
-    # 1) Make sure the plan belongs to the current user
-    plan = DegreePlan.query.filter_by(
-        id=plan_id,
-        user_id=current_user.id,
-    ).first()
-    if plan is None:
-        abort(404)
-
-    # 2) Look up the course inside this plan
-    course = Course.query.filter_by(
-        id=course_id,
-        degree_plan_id=plan.id,
-    ).first()
-    if course is None:
-        abort(404)
+    # 1) Plan belongs to current user + course belongs to this plan (one SELECT ... JOIN)
+    plan, course = _load_plan_and_course(plan_id, course_id)
 
     if request.method == "POST":
-        code = (request.form.get("code") or "").strip()
-        name = (request.form.get("name") or "").strip()
-        credits_raw = (request.form.get("credits") or "").strip()
-        difficulty_raw = (request.form.get("difficulty") or "").strip()
+        code, name, credits_raw, difficulty_raw = form_fields(
+            request.form, "code", "name", "credits", "difficulty"
+        )
 
         if not code or not name:
-            flash("Course code and name are required.", "error")
-            return redirect(url_for("main.edit_course", plan_id=plan.id, course_id=course.id))
+            return _render_edit_form(plan, course, "Course code and name are required.")
 
         # Credits validation
-        if not credits_raw:
-            flash("Credits are required.", "error")
-            return render_template(url_for("main.edit_course", plan_id=plan.id, course_id=course.id))
-        
-        try:
-            credits_val = float(credits_raw)
-        except ValueError:
-            flash("Credits must be a number.", "error")
-            return redirect(url_for("main.edit_course", plan_id=plan.id, course_id=course.id))
-
-        if credits_val <= 0:
-            flash("Credit must be positive.", "error")
-            return redirect(url_for("main.edit_course", plan_id=plan.id, course_id=course.id))
-        
-        # 5) Difficulty (optional)
-        difficulty_val = None
-        if difficulty_raw:
-            try:
-                diff = int(difficulty_raw)
-            except ValueError:
-                flash("Difficulty must be a number between 1 and 5.", "error")
-                return redirect(url_for("main.edit_course", plan_id=plan.id, course_id=course.id))
-
-            if diff < 1 or diff > 5:
-                flash("Difficulty must be between 1 and 5.", "error")
-                return redirect(url_for("main.edit_course", plan_id=plan.id, course_id=course.id))
-
-            difficulty_val = diff
-
-
-        # ensure codes are unique within this plan (excluding this course)
-        existing = Course.query.filter_by(
-            degree_plan_id=plan.id,
-            code=code,
-        ).first()
-        if existing and existing.id != course.id:
-            flash("Another course with that code already exists in this plan.", "error")
-            return redirect(url_for("main.edit_course", plan_id=plan.id, course_id=course.id))
-
-        # update course
+        credits_val, err = parse_credits(credits_raw)
+        if err:
+            return _render_edit_form(plan, course, err)
+
+        # Difficulty (optional)
+        difficulty_val, err = parse_difficulty(difficulty_raw)
+        if err:
+            return _render_edit_form(plan, course, err)
+
+        # update course; a code clash with another course in this plan trips uq_course_plan_code
         course.code = code
         course.name = name
         course.credits = credits_val
         course.difficulty = difficulty_val
 
-        db.session.commit()
-        flash("Course updated.", "success")
-        return redirect(url_for("main.course_detail", plan_id=plan.id, course_id=course.id))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return _render_edit_form(plan, course, "Another course with that code already exists in this plan.")
+        return redirect(
+            url_for("main.course_detail", plan_id=plan.id, course_id=course.id, notice="course_updated"),
+            code=303,
+        )
 
     # GET: show the edit form
     return render_template("edit_course.html", plan=plan, course=course)
@@ -189,86 +150,40 @@ def edit_course(plan_id: int, course_id: int):
 @main_bp.route("/plans/<int:plan_id>/courses/<int:course_id>/delete", methods=["POST"])
 @login_required
 def delete_course(plan_id: int, course_id: int):
-    # 1) Make sure the plan belongs to the current user
-    plan = DegreePlan.query.filter_by(
-        id=plan_id,
-        user_id=current_user.id,
-    ).first()
-    if plan is None:
-        abort(404)
-
-    # 2) Find the course inside this plan
-    course = Course.query.filter_by(
-        id=course_id,
-        degree_plan_id=plan.id,
-    ).first()
-    if course is None:
-        abort(404)
+    # 1) Plan belongs to current user + course belongs to this plan (one SELECT ... JOIN)
+    plan, course = _load_plan_and_course(plan_id, course_id, *_n1_guard())
 
-    # 3) Delete all related offerings + prereqs pointing to this course
-    CourseOffering.query.filter_by(course_id=course.id).delete()
-    Prerequisite.query.filter_by(
-        degree_plan_id=plan.id,
-        course_id=course.id,
-    ).delete()
-    Prerequisite.query.filter_by(
-        degree_plan_id=plan.id,
-        prereq_course_id=course.id,
-    ).delete()
-
-    # 4) Delete the course itself
+    # 2) Delete the course. Offerings and prereq edges (both directions) go with it via
+    # ON DELETE CASCADE in the database; the relationships are passive_deletes=True, so
+    # the ORM doesn't load or delete them itself.
     db.session.delete(course)
     db.session.commit()
 
-    flash("Course deleted.", "success")
-    return redirect(url_for("main.view_plan", plan_id=plan.id))
+    return redirect(url_for("main.view_plan", plan_id=plan.id, notice="course_deleted"), code=303)
 
 
 @main_bp.route("/plans/<int:plan_id>/courses/<int:course_id>/offerings", methods=["GET", "POST"])
 @login_required
 def edit_offerings(plan_id: int, course_id: int):
-    # 1) Make sure plan belongs to current user
-    plan = DegreePlan.query.filter_by(
-        id=plan_id,
-        user_id=current_user.id,
-    ).first()
-    if plan is None:
-        abort(404)
-
-    # 2) Make sure course belongs to this plan
-    course = Course.query.filter_by(
-        id=course_id,
-        degree_plan_id=plan.id,
-    ).first()
-    if course is None:
-        abort(404)
+    # 1) Plan belongs to current user + course belongs to this plan (one SELECT ... JOIN)
+    plan, course = _load_plan_and_course(plan_id, course_id, *_n1_guard())
 
     # POST: update offerings based on checkboxes from the tab form
     if request.method == "POST":
         selected_raw = request.form.getlist("semesters")  # list of "1", "2", ...
         try:
-            selected_semesters = sorted({int(s) for s in selected_raw})
+            selected_semesters = {int(s) for s in selected_raw}
         except ValueError:
-            selected_semesters = []
+            selected_semesters = set()
 
-        # Clear existing offerings for this course
-        CourseOffering.query.filter_by(course_id=course.id).delete()
-
-        # Insert the new ones
-        for s in selected_semesters:
-            db.session.add(
-                CourseOffering(
-                    course_id=course.id,
-                    semester_number=s,
-                )
-            )
+        # One UPDATE of the course's offerings bitmask (no per-semester rows to delete/insert)
+        course.offered_semesters = selected_semesters
 
         db.session.commit()
-        flash("Offerings updated.", "success")
-
         # Back to the unified course page with tabs
         return redirect(
-            url_for("main.course_detail", plan_id=plan.id, course_id=course.id)
+            url_for("main.course_detail", plan_id=plan.id, course_id=course.id, notice="offerings_updated"),
+            code=303,
         )
 
     # GET: we don't show a separate offerings page anymore,
@@ -276,18 +191,7 @@ def edit_offerings(plan_id: int, course_id: int):
     return redirect(
         url_for("main.course_detail", plan_id=plan.id, course_id=course.id)
     )
-    
-    # GET: collect currently selected semesters
-    # assumes a relationship Course.offerings exists
-    existing_semesters = {o.semester_number for o in course.offerings}
 
-    return render_template(
-        "edit_offerings.html",
-        plan=plan,
-        course=course,
-        total_semesters=total_semesters,
-        selected_semesters=existing_semesters,
-    )
 """ 
 In function above, every branch here either
         →   aborts with 404
@@ -299,55 +203,75 @@ In function above, every branch here either
 @main_bp.route("/plans/<int:plan_id>/courses/<int:course_id>")
 @login_required
 def course_detail(plan_id: int, course_id: int):
-    # Plan must belong to current user
-    plan = DegreePlan.query.filter_by(
-        id=plan_id,
-        user_id=current_user.id,
-    ).first()
-    if plan is None:
-        abort(404)
+    # 1) Plan belongs to current user + course belongs to this plan (one SELECT ... JOIN)
+    plan, course = _load_plan_and_course(
+        plan_id,
+        course_id,
+        joinedload(DegreePlan.constraints),
+        *_n1_guard(),
+    )
+    return _render_course_detail(plan, course)
 
-    # Course must belong to this plan
-    course = Course.query.filter_by(
-        id=course_id,
-        degree_plan_id=plan.id,
-    ).first()
-    if course is None:
-        abort(404)
 
-    # Plan constraints → total_semesters (for offerings tab)
-    constraints = PlanConstraint.query.filter_by(
-        degree_plan_id=plan.id
-    ).first()
+def _render_course_detail(plan: DegreePlan, course: Course, **context):
+    """
+    Render course_detail.html for an already-loaded (and ownership-checked) plan + course.
+    add_prereq reuses it to show validation errors without a redirect round trip.
+    """
+    # Plan constraints → total_semesters (for offerings tab); joined into the query above
+    constraints = plan.constraints
     total_semesters = constraints.total_semesters if constraints and constraints.total_semesters else 6
 
     # Selected semesters for this course (offerings tab)
-    selected_semesters = [off.semester_number for off in course.offerings]
+    selected_semesters = course.offered_semesters
 
     # Semester labels for UI (Year/Term when semesters_per_year is set)
     semesters_per_year = constraints.semesters_per_year if constraints else None
     semester_labels = {s: format_semester_label(s, semesters_per_year) for s in range(1, total_semesters + 1)}
 
-    # Incoming prereqs: what this course REQUIRES
-    incoming_prereqs = Prerequisite.query.filter_by(
-        degree_plan_id=plan.id,
-        course_id=course.id,
+    # Only id/code/name are shown for the other courses and edges, so project those
+    # columns as plain rows instead of hydrating Course/Prerequisite objects.
+    all_courses = db.session.execute(
+        select(Course.id, Course.code, Course.name)
+        .where(Course.degree_plan_id == plan.id)
+        .order_by(Course.code)
+    ).all()
+    course_by_id = {c.id: c for c in all_courses}
+
+    # Edges touching this course (either direction), split into incoming/outgoing in one pass
+    edge_rows = db.session.execute(
+        select(Prerequisite.id, Prerequisite.course_id, Prerequisite.prereq_course_id)
+        .where(
+            Prerequisite.degree_plan_id == plan.id,
+            or_(
+                Prerequisite.course_id == course.id,
+                Prerequisite.prereq_course_id == course.id,
+            ),
+        )
     ).all()
 
+    # Incoming prereqs: what this course REQUIRES
     # Outgoing prereqs: courses that depend on THIS course
-    outgoing_prereqs = Prerequisite.query.filter_by(
-        degree_plan_id=plan.id,
-        prereq_course_id=course.id,
-    ).all()
+    incoming_prereqs = []
+    outgoing_prereqs = []
+    for e in edge_rows:
+        dependent = course_by_id.get(e.course_id)
+        prereq = course_by_id.get(e.prereq_course_id)
+        if dependent is None or prereq is None:
+            # Either FK points to a course in a different plan or missing – skip
+            continue
+        edge = {
+            "id": e.id,
+            "course": dependent,
+            "prereq_course": prereq,
+        }
+        if e.course_id == course.id:
+            incoming_prereqs.append(edge)
+        if e.prereq_course_id == course.id:
+            outgoing_prereqs.append(edge)
 
     # Courses you can still add as prereqs (same plan, not itself, not already a prereq)
-    all_courses = (
-        Course.query
-        .filter_by(degree_plan_id=plan.id)
-        .order_by(Course.code)
-        .all()
-    )
-    already_prereq_ids = {edge.prereq_course_id for edge in incoming_prereqs}
+    already_prereq_ids = {edge["prereq_course"].id for edge in incoming_prereqs}
     available_prereq_courses = [
         c for c in all_courses
         if c.id != course.id and c.id not in already_prereq_ids
@@ -357,21 +281,24 @@ def course_detail(plan_id: int, course_id: int):
     # Cycle-risk detection for UI: disable any candidate prereq that would create a cycle.
     # Adding an edge (candidate_prereq -> course) creates a cycle iff course can already reach candidate_prereq
     # through existing prereq edges (prereq -> dependent).
-    
-    edges = Prerequisite.query.filter_by(degree_plan_id=plan.id).all()
-    adj = {}
-    for e in edges:
-        adj.setdefault(e.prereq_course_id, []).append(e.course_id)
-
-    reachable = set()
-    stack = [course.id]
-    while stack:
-        node = stack.pop()
-        for nxt in adj.get(node, []):
-            if nxt in reachable:
-                continue
-            reachable.add(nxt)
-            stack.append(nxt)
+    # The reachability walk runs in SQL as a recursive CTE, so only the reachable ids come back.
+    # UNION (not UNION ALL) drops already-seen ids, so an existing cycle can't recurse forever.
+    reach = (
+        select(Prerequisite.course_id.label("n"))
+        .where(
+            Prerequisite.degree_plan_id == plan.id,
+            Prerequisite.prereq_course_id == course.id,
+        )
+        .cte("reach", recursive=True)
+    )
+    reach = reach.union(
+        select(Prerequisite.course_id)
+        .where(
+            Prerequisite.degree_plan_id == plan.id,
+            Prerequisite.prereq_course_id == reach.c.n,
+        )
+    )
+    reachable = set(db.session.execute(select(reach.c.n)).scalars())
 
     cycle_risk_ids = reachable
 
@@ -387,100 +314,66 @@ def course_detail(plan_id: int, course_id: int):
         available_prereq_courses=available_prereq_courses,
         cycle_risk_ids=cycle_risk_ids,
         semester_labels=semester_labels,
+        **context,
     )
 
 @main_bp.route("/plans/<int:plan_id>/courses/<int:course_id>/prereqs/add", methods=["POST"])
 @login_required
 def add_prereq(plan_id: int, course_id: int):
-    plan = DegreePlan.query.filter_by(
-        id=plan_id,
-        user_id=current_user.id,
-    ).first()
-    if plan is None:
-        abort(404)
-
-    course = Course.query.filter_by(
-        id=course_id,
-        degree_plan_id=plan.id,
-    ).first()
-    if course is None:
-        abort(404)
+    # 1) Plan belongs to current user + course belongs to this plan (one SELECT ... JOIN)
+    plan, course = _load_plan_and_course(plan_id, course_id, joinedload(DegreePlan.constraints))
 
     prereq_raw = (request.form.get("prereq_course_id") or "").strip()
     if not prereq_raw:
-        flash("Select a course to add as a prerequisite.", "error")
-        return redirect(url_for("main.course_detail", plan_id=plan.id, course_id=course.id))
+        return _render_course_detail(plan, course, errors=["Select a course to add as a prerequisite."]), 400
 
     try:
         prereq_id = int(prereq_raw)
     except ValueError:
-        flash("Invalid course selected.", "error")
-        return redirect(url_for("main.course_detail", plan_id=plan.id, course_id=course.id))
+        return _render_course_detail(plan, course, errors=["Invalid course selected."]), 400
 
     if prereq_id == course.id:
-        flash("A course cannot be a prerequisite of itself.", "error")
-        return redirect(url_for("main.course_detail", plan_id=plan.id, course_id=course.id))
-
-    prereq_course = Course.query.filter_by(
-        id=prereq_id,
-        degree_plan_id=plan.id,
-    ).first()
-    if prereq_course is None:
-        flash("Selected course is not in this plan.", "error")
-        return redirect(url_for("main.course_detail", plan_id=plan.id, course_id=course.id))
+        return _render_course_detail(plan, course, errors=["A course cannot be a prerequisite of itself."]), 400
 
-    # Avoid duplicates
-    existing = Prerequisite.query.filter_by(
-        degree_plan_id=plan.id,
-        course_id=course.id,
-        prereq_course_id=prereq_course.id,
-    ).first()
-    if existing:
-        flash("That prerequisite already exists.", "error")
-        return redirect(url_for("main.course_detail", plan_id=plan.id, course_id=course.id))
+    prereq_course = db.session.get(Course, prereq_id)
+    if prereq_course is None or prereq_course.degree_plan_id != plan.id:
+        return _render_course_detail(plan, course, errors=["Selected course is not in this plan."]), 400
 
+    # Duplicate edges are rejected by uq_prereq_plan_course_prereq on INSERT
     edge = Prerequisite(
         degree_plan_id=plan.id,
         course_id=course.id,
         prereq_course_id=prereq_course.id,
     )
     db.session.add(edge)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return _render_course_detail(plan, course, errors=["That prerequisite already exists."]), 400
 
-    flash("Prerequisite added.", "success")
-    return redirect(url_for("main.course_detail", plan_id=plan.id, course_id=course.id))
+    return redirect(
+        url_for("main.course_detail", plan_id=plan.id, course_id=course.id, notice="prereq_added"),
+        code=303,
+    )
 
 
 @main_bp.route("/plans/<int:plan_id>/courses/<int:course_id>/prereqs/<int:prereq_id>/delete", methods=["POST"])
 @login_required
 def delete_prereq(plan_id: int, course_id: int, prereq_id: int):
-    # Ensure plan belongs to current user
-    plan = DegreePlan.query.filter_by(
-        id=plan_id,
-        user_id=current_user.id,
-    ).first()
-    if plan is None:
-        abort(404)
-
-    # Ensure course belongs to this plan
-    course = Course.query.filter_by(
-        id=course_id,
-        degree_plan_id=plan.id,
-    ).first()
-    if course is None:
-        abort(404)
+    # 1) Plan belongs to current user + course belongs to this plan (one SELECT ... JOIN)
+    plan, course = _load_plan_and_course(plan_id, course_id)
 
     # Find the prereq edge and ensure it belongs to this plan+course
-    edge = Prerequisite.query.filter_by(
-        id=prereq_id,
-        degree_plan_id=plan.id,
-    ).first()
-    if edge is None:
+    edge = db.session.get(Prerequisite, prereq_id)
+    if edge is None or edge.degree_plan_id != plan.id:
         flash("Prerequisite not found.", "error")
         return redirect(url_for("main.course_detail", plan_id=plan.id, course_id=course.id))
 
     db.session.delete(edge)
     db.session.commit()
 
-    flash("Prerequisite removed.", "success")
-    return redirect(url_for("main.course_detail", plan_id=plan.id, course_id=course.id))
+    return redirect(
+        url_for("main.course_detail", plan_id=plan.id, course_id=course.id, notice="prereq_removed"),
+        code=303,
+    )
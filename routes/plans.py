@@ -1,5 +1,7 @@
 from flask import render_template, redirect, url_for, request, abort, flash, current_app
 from flask_login import login_required, current_user
+from sqlalchemy import exists, or_, select
+from sqlalchemy.orm import joinedload
 
 
 from . import main_bp
@@ -13,6 +15,18 @@ from utils.course_catalog import load_catalog
 from services.solver import build_inputs_from_plan, build_model
 from pulp import PULP_CBC_CMD, LpStatus
 
+
+def owned_plan(plan_id: int, *options) -> DegreePlan:
+    """
+    Primary-key lookup of a plan owned by current_user (identity map first, then SQL).
+    404 when it doesn't exist or belongs to someone else.
+    """
+    plan = db.session.get(DegreePlan, plan_id, options=options or None)
+    if plan is None or plan.user_id != current_user.id:
+        abort(404)
+    return plan
+
+
 @main_bp.route("/")
 def home():
     # uses templates/home.html
@@ -22,8 +36,11 @@ def home():
 @main_bp.route("/dashboard")
 @login_required
 def dashboard():
-    # Fetch plans for the logged-in user
-    degree_plans = DegreePlan.query.filter_by(user_id=current_user.id).all()
+    # Fetch plans for the logged-in user: just the columns the list shows, as plain rows
+    degree_plans = db.session.execute(
+        select(DegreePlan.id, DegreePlan.name, DegreePlan.created_at)
+        .where(DegreePlan.user_id == current_user.id)
+    ).all()
     return render_template("dashboard.html", degree_plans=degree_plans)
 
 
@@ -32,21 +49,24 @@ def dashboard():
 def create_plan():
     if request.method == "POST":
         name = (request.form.get("name") or "").strip()
+        uid = current_user.id
 
         if not name:
             flash("Plan name is required.", "error")
             return redirect(url_for("main.create_plan"))
         
         # check if this user already has a plan with the same name
-        existing = DegreePlan.query.filter_by(
-            user_id=current_user.id,
-            name=name,
-        ).first()
-        if existing:
+        name_taken = db.session.query(
+            exists().where(
+                DegreePlan.user_id == uid,
+                DegreePlan.name == name,
+            )
+        ).scalar()
+        if name_taken:
             flash("Plan of this name already exists.", "error")
             return redirect(url_for("main.create_plan"))
 
-        plan = DegreePlan(user_id=current_user.id, name=name)
+        plan = DegreePlan(user_id=uid, name=name)
         db.session.add(plan)
         db.session.commit()
 
@@ -61,14 +81,19 @@ def create_plan():
 def view_plan(plan_id: int):
    # show a single plan, with its courses listed and a simple 'add course' form
  
-    plan = DegreePlan.query.filter_by(
-        id = plan_id,
-        user_id = current_user.id,
-    ).first()
-    if plan is None:
-        abort(404)
+    # constraints ride along on the plan SELECT (one-to-one, joined)
+    plan = owned_plan(plan_id, joinedload(DegreePlan.constraints))
+    return render_plan_detail(plan)
+
+
+def render_plan_detail(plan: DegreePlan, **context):
+    """
+    Render plan_detail.html for an already-loaded (and ownership-checked) plan.
+    Shared with add_course so a validation error re-renders the page in the same
+    request instead of redirecting back through view_plan.
+    """
     courses = Course.query.filter_by(degree_plan_id=plan.id).order_by(Course.id).all()
-    constraints = PlanConstraint.query.filter_by(degree_plan_id=plan.id).first()
+    constraints = plan.constraints
 
     catalog_dir = current_app.config.get("CATALOG_DIR")
     catalog_courses = load_catalog(catalog_dir) if catalog_dir else []
@@ -79,21 +104,19 @@ def view_plan(plan_id: int):
         courses = courses,
         constraints=constraints,
         catalog_courses=catalog_courses,
+        **context,
     )
 
 @main_bp.route("/plans/<int:plan_id>/settings", methods=["GET", "POST"])
 @login_required
 def plan_settings(plan_id: int):
     # 1) Make sure the plan belongs to the current user
-    plan = DegreePlan.query.filter_by(
-        id=plan_id,
-        user_id=current_user.id,
-    ).first()
-    if plan is None:
-        abort(404)
+    plan = owned_plan(plan_id, joinedload(DegreePlan.constraints))
 
-    # 2) Get or create the constraint row for this plan
-    pc = PlanConstraint.query.filter_by(degree_plan_id=plan.id).first()
+    # 2) Get the constraint row for this plan (loaded with the plan above).
+    # If there isn't one yet, build the defaults in memory only; it's persisted on POST,
+    # so just viewing the settings page never writes.
+    pc = plan.constraints
     if pc is None:
         pc = PlanConstraint(
             degree_plan_id=plan.id,
@@ -105,10 +128,11 @@ def plan_settings(plan_id: int):
             years=None,                 # optional, in the plan 
             semesters_per_year=None,    # optional, in the plan 
         )
-        db.session.add(pc)
-        db.session.commit()
 
     if request.method == "POST":
+        # every validation error below redirects back here
+        settings_url = url_for("main.plan_settings", plan_id=plan.id)
+
         # ---- plan structure (optional): labels only ----
         years_raw = (request.form.get("years") or "").strip()
         semesters_per_year_raw = (request.form.get("semesters_per_year") or "").strip()
@@ -120,22 +144,22 @@ def plan_settings(plan_id: int):
             # If one is provided, require both (keeps it consistent)
             if not years_raw or not semesters_per_year_raw:
                 flash("Plan structure requires both Years and Semesters per year (or leave both blank).", "error")
-                return redirect(url_for("main.plan_settings", plan_id=plan.id))
+                return redirect(settings_url)
 
             try:
                 years_val = int(years_raw)
                 semesters_per_year_val = int(semesters_per_year_raw)
             except ValueError:
                 flash("Years and semesters per year must be whole numbers.", "error")
-                return redirect(url_for("main.plan_settings", plan_id=plan.id))
+                return redirect(settings_url)
 
             if years_val < 1 or years_val > 10:
                 flash("Years must be between 1 and 10.", "error")
-                return redirect(url_for("main.plan_settings", plan_id=plan.id))
+                return redirect(settings_url)
 
             if semesters_per_year_val < 1 or semesters_per_year_val > 6:
                 flash("Semesters per year must be between 1 and 6.", "error")
-                return redirect(url_for("main.plan_settings", plan_id=plan.id))
+                return redirect(settings_url)
 
         # ---- total semesters (solver bound; always explicit) ----
         total_semesters_raw = (request.form.get("total_semesters") or "").strip()
@@ -143,12 +167,12 @@ def plan_settings(plan_id: int):
             total_semesters_val = int(total_semesters_raw)
         except ValueError:
             flash("Total semesters must be a whole number.", "error")
-            return redirect(url_for("main.plan_settings", plan_id=plan.id))
+            return redirect(settings_url)
 
         # Validate total semesters regardless of source
         if total_semesters_val < 1 or total_semesters_val > 20:
             flash("Total semesters must be between 1 and 20.", "error")
-            return redirect(url_for("main.plan_settings", plan_id=plan.id))
+            return redirect(settings_url)
 
         # ---- max credits per semester (blank means no limit) ----
         max_credits_raw = (request.form.get("max_credits_per_semester") or "").strip()
@@ -159,11 +183,11 @@ def plan_settings(plan_id: int):
                 max_credits_val = int(max_credits_raw)
             except ValueError:
                 flash("Max credits per semester must be a whole number (or left blank).", "error")
-                return redirect(url_for("main.plan_settings", plan_id=plan.id))
+                return redirect(settings_url)
 
             if max_credits_val < 1 or max_credits_val > 60:
                 flash("Max credits per semester must be between 1 and 60.", "error")
-                return redirect(url_for("main.plan_settings", plan_id=plan.id))
+                return redirect(settings_url)
 
         # ---- solver flags ----
         enforce_prereqs_val = request.form.get("enforce_prereqs") == "on"
@@ -179,6 +203,7 @@ def plan_settings(plan_id: int):
         pc.enforce_credit_limits = enforce_credit_limits_val
         pc.minimize_last_semester = minimize_last_semester_val
 
+        db.session.add(pc)  # no-op for an existing row, INSERT for first-time defaults
         db.session.commit()
 
         flash("Plan settings updated.", "success")
@@ -194,15 +219,18 @@ def plan_settings(plan_id: int):
 @main_bp.post("/plans/<int:plan_id>/delete")
 @login_required
 def delete_plan(plan_id: int):
-    plan = DegreePlan.query.get_or_404(plan_id)
-    if plan.user_id != current_user.id:
-        abort(403)
-
-    has_courses = Course.query.filter_by(degree_plan_id=plan.id).first() is not None
-    has_prereqs = Prerequisite.query.filter_by(degree_plan_id=plan.id).first() is not None
-    has_constraints = PlanConstraint.query.filter_by(degree_plan_id=plan.id).first() is not None
+    plan = owned_plan(plan_id)
+
+    # One round trip: three EXISTS probes OR'ed together, no rows hydrated
+    has_children = db.session.query(
+        or_(
+            exists().where(Course.degree_plan_id == plan.id),
+            exists().where(Prerequisite.degree_plan_id == plan.id),
+            exists().where(PlanConstraint.degree_plan_id == plan.id),
+        )
+    ).scalar()
 
-    if has_courses or has_prereqs or has_constraints:
+    if has_children:
         flash("Delete blocked: delete all courses first (and any prerequisites/settings).", "warning")
         return redirect(url_for("main.view_plan", plan_id=plan.id))
     db.session.delete(plan)
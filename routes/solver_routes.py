@@ -1,14 +1,20 @@
 # routes/solver_routes.py
 
-from flask import render_template, redirect, url_for, request, abort, flash
-from flask_login import login_required, current_user
+from collections import defaultdict
+from datetime import datetime
 
-from pulp import LpStatus, PULP_CBC_CMD
+from flask import render_template, redirect, url_for, request, flash
+from flask_login import login_required
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 
 from . import main_bp
+from .plans import owned_plan
 from models.degree_plan import DegreePlan
-from models.plan_constraint import PlanConstraint
-from services.solver import build_inputs_from_plan, build_model
+from models.plan_solution import PlanSolution
+from services.solver import PROVEN_STATUSES, build_inputs_from_plan, inputs_digest
+from services.solve_jobs import discard_job, get_job, submit_solve
 from extensions import db
 from utils.semesters import format_semester_label
 from services.validation import validate_inputs_before_solve
@@ -21,8 +27,8 @@ def solve_plan(plan_id: int):
     User-facing route:
     - checks the plan belongs to the current user
     - builds solver inputs from the DB
-    - runs the MILP solver
-    - renders a semester-by-semester schedule
+    - starts the MILP solver in the background
+    - redirects to solve_status, which renders the semester-by-semester schedule
     """
     # Safety: this endpoint is intended to be triggered from a POST button.
     # If a user hits it via GET (typing the URL for example), redirect them back.
@@ -31,12 +37,7 @@ def solve_plan(plan_id: int):
         return redirect(url_for("main.view_plan", plan_id=plan_id))
 
     # ensure the plan exists and belongs to the current user
-    plan = DegreePlan.query.filter_by(
-        id=plan_id,
-        user_id=current_user.id,
-    ).first()
-    if plan is None:
-        abort(404)
+    plan = owned_plan(plan_id, joinedload(DegreePlan.constraints))
 
     # Build inputs from DB
     try:
@@ -64,32 +65,103 @@ def solve_plan(plan_id: int):
 
 
     # Solver flags come from PlanConstraint (Plan settings)
-    pc = PlanConstraint.query.filter_by(degree_plan_id=plan.id).first()
+    pc = plan.constraints
     # default behavior if settings row is missing
     use_prereqs = True if pc is None else bool(pc.enforce_prereqs)
     use_credit_limits = True if pc is None else bool(pc.enforce_credit_limits)
     minimize_last_semester = True if pc is None else bool(pc.minimize_last_semester)
 
-    # Build and solve the model
-    model, x = build_model(
-        inputs["courses"],
-        inputs["prereqs"],
-        inputs["allowed_semesters"],
-        inputs["credits"],
-        inputs["max_credits_per_semester"],
+    flags = dict(
         use_credit_limits=use_credit_limits,
         use_prereqs=use_prereqs,
         minimize_last_semester=minimize_last_semester,
     )
 
-    model.solve(PULP_CBC_CMD(msg=0))
-    status = LpStatus[model.status]
+    # Stored result for exactly these inputs (any app process solved it)? Render it directly.
+    digest = inputs_digest(inputs, **flags)
+    saved = db.session.get(PlanSolution, plan.id)
+    if saved is not None and saved.inputs_hash == digest and saved.status in PROVEN_STATUSES:
+        return _render_schedule(plan, inputs, saved.status, saved.chosen)
+
+    # Solve in the background (see services/solve_jobs.py) and let the status page poll.
+    # solve_schedule is cached on the inputs, so an unchanged plan finishes immediately.
+    job_id = submit_solve(
+        plan.id,
+        inputs,
+        digest,
+        **flags,
+    )
+    return redirect(url_for("main.solve_status", plan_id=plan.id, job_id=job_id), code=303)
+
+
+@main_bp.route("/plans/<int:plan_id>/solve/<job_id>")
+@login_required
+def solve_status(plan_id: int, job_id: str):
+    plan = owned_plan(plan_id, joinedload(DegreePlan.constraints))
+
+    job = get_job(job_id)
+    if job is None or job[0] != plan.id:
+        flash("That solver run is no longer available. Please solve again.", "warning")
+        return redirect(url_for("main.view_plan", plan_id=plan.id))
+
+    _, inputs, digest, future = job
+    if not future.done():
+        # page refreshes itself until the solver is done, backing off 1s, 2s, ... up to 5s
+        # so a long solve doesn't keep a steady 1 req/s per open tab
+        poll = request.args.get("poll", 0, type=int)
+        return render_template(
+            "plan_solving.html",
+            plan=plan,
+            refresh_seconds=min(1 + poll, 5),
+            refresh_url=url_for("main.solve_status", plan_id=plan.id, job_id=job_id, poll=poll + 1),
+        ), 202
+
+    try:
+        status, _sol_status, chosen_by_course = future.result()
+    except Exception as e:
+        # solver crashed (or isn't installed): drop the job so polling stops hitting it
+        print(f"[solver] Plan {plan.id} solve failed: {e!r}")
+        discard_job(job_id)
+        flash("The solver failed on this plan. Please try again.", "error")
+        return redirect(url_for("main.view_plan", plan_id=plan.id))
+    _save_solution(plan.id, digest, status, chosen_by_course)
+    return _render_schedule(plan, inputs, status, chosen_by_course)
+
+
+def _save_solution(plan_id: int, digest: str, status: str, chosen_by_course) -> None:
+    # keep only the latest proven result per plan; a time-limited ("Feasible") or unsolved
+    # run isn't stored, so the next solve gets another chance at it
+    if status not in PROVEN_STATUSES:
+        return
+    # skip the write when it's already stored
+    saved = db.session.get(PlanSolution, plan_id)
+    if saved is not None and saved.inputs_hash == digest:
+        return
+    if saved is None:
+        saved = PlanSolution(degree_plan_id=plan_id)
+        db.session.add(saved)
+    saved.inputs_hash = digest
+    saved.status = status
+    saved.chosen = chosen_by_course
+    saved.solved_at = datetime.utcnow()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # another request stored this plan's first result at the same moment; theirs is fine
+        db.session.rollback()
+
+
+def _render_schedule(plan: DegreePlan, inputs, status: str, chosen_by_course):
+    pc = plan.constraints
     prereqs = inputs.get("prereqs", {})
     allowed = inputs.get("allowed_semesters", {})
 
     infeasible_hints = []
 
-    if status != "Optimal":
+    # "Feasible": the solver hit its time limit with a valid but unproven schedule
+    has_schedule = status in ("Optimal", "Feasible")
+
+    if not has_schedule:
 
         # (A) Missing offerings: course has no allowed semesters
         no_offerings = [c for c in inputs.get("courses", []) if not allowed.get(c)]
@@ -148,10 +220,10 @@ def solve_plan(plan_id: int):
         )
 
     # Cycle hint
-    graph = {}
+    graph = defaultdict(list)
     for course, pres in prereqs.items():
         for pre in pres:
-            graph.setdefault(pre, []).append(course)
+            graph[pre].append(course)
 
     visited = set()
     on_stack = set()
@@ -178,45 +250,36 @@ def solve_plan(plan_id: int):
                 
     semesters = sorted(inputs["max_credits_per_semester"].keys())
     semesters_per_year = pc.semesters_per_year if pc and pc.semesters_per_year else None
-    semester_labels = {s: format_semester_label(s, semesters_per_year) for s in semesters}
 
-    courses_by_semester = {s: [] for s in semesters}
+    # Only semesters that got a course are filled; the template reads buckets with .get(sem, [])
+    courses_by_semester = defaultdict(list)
 
-    if status == "Optimal":
-        # Setup: Map course_code → Course row
-        course_by_code = {c.code: c for c in plan.courses}
+    if has_schedule:
+        # Names/difficulty came with the course rows build_inputs_from_plan already loaded
+        course_info = inputs.get("course_info", {})
 
-        # Extract chosen semester per course
+        # One pass: bucket each course straight into its chosen semester
         for c in inputs["courses"]:
-            chosen_semester = None
-            for s in inputs["allowed_semesters"][c]:
-                var = x[c][s]
-                if var.varValue is not None and var.varValue > 0.5:
-                    chosen_semester = s
-                    break
-            
+            chosen_semester = chosen_by_course.get(c)
             if chosen_semester is None:
                 continue
 
-            course_obj = course_by_code.get(c)
-
-            # KeyError
-            courses_by_semester.setdefault(chosen_semester, []).append(
+            name, difficulty = course_info.get(c, (c, None))
+            courses_by_semester[chosen_semester].append(
                 {
                     "code": c,
-                    "name": course_obj.name if course_obj else c,
+                    "name": name,
                     "credits": inputs["credits"][c],
-                    "difficulty": getattr(course_obj, "difficulty", None),
+                    "difficulty": difficulty,
                 }
             )
-        
-        # Trim empty semesters 
-        used = [s for s, lst in courses_by_semester.items() if lst]
-        if used:
-            last_used = max(used)
+
+        # Trim empty semesters after the last used one
+        if courses_by_semester:
+            last_used = max(courses_by_semester)
             semesters = [s for s in semesters if s <= last_used]
-            courses_by_semester = {s: courses_by_semester.get(s, []) for s in semesters}
-            semester_labels = {s: semester_labels.get(s, f"Semester {s}") for s in semesters}
+
+    semester_labels = {s: format_semester_label(s, semesters_per_year) for s in semesters}
 
     #print("STATUS:", status)
     #print("SEMESTERS:", semesters)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Union, List
+from typing import ClassVar, Union, List
 
 @dataclass(frozen=True)
 class ReqLeaf:
@@ -10,12 +10,19 @@ class ReqLeaf:
     raw: str
     kind: str = "internal" # "internal" | "external" | "unresolved"
 
+    # cheap node-type check for tree walkers (one attribute load instead of isinstance)
+    IS_LEAF: ClassVar[bool] = True
+
 @dataclass(frozen=True)
 class ReqAnd:
     items: List["Req"]
 
+    IS_LEAF: ClassVar[bool] = False
+
 @dataclass(frozen=True)
 class ReqOr:
     items: List["Req"]
 
+    IS_LEAF: ClassVar[bool] = False
+
 Req = Union[ReqLeaf, ReqAnd, ReqOr]
@@ -0,0 +1,70 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from threading import RLock
+from typing import Dict, Optional, Tuple
+import uuid
+
+from services.solver import solve_schedule
+
+
+# Background solving for the web app.
+# The request builds the inputs (DB work stays on the request thread), hands the
+# pure solve_schedule(...) call to this pool and returns right away; the status
+# route polls the Future. CBC itself runs in a subprocess, so threads are enough here.
+#
+# Jobs live in this process only: with several app processes, a poll that lands on
+# another process just reports the job as gone and the user re-solves.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="solve")
+
+# job_id -> (plan_id, inputs, inputs_hash, future); bounded, oldest jobs dropped first
+_JOBS_MAX = 256
+_jobs: OrderedDict[str, Tuple[int, Dict, str, Future]] = OrderedDict()
+
+# inputs_hash -> Future still running: a double-click (or a second tab) on an unchanged
+# plan attaches to the solve already in progress instead of starting another CBC run
+_in_flight: Dict[str, Future] = {}
+# re-entrant: add_done_callback runs _forget inline if the future is already done
+_lock = RLock()
+
+
+def submit_solve(
+    plan_id: int,
+    inputs: Dict,
+    inputs_hash: str,
+    *,
+    use_credit_limits: bool,
+    use_prereqs: bool,
+    minimize_last_semester: bool,
+) -> str:
+    job_id = uuid.uuid4().hex
+    with _lock:
+        future = _in_flight.get(inputs_hash)
+        if future is None:
+            future = _executor.submit(
+                solve_schedule,
+                inputs,
+                use_credit_limits=use_credit_limits,
+                use_prereqs=use_prereqs,
+                minimize_last_semester=minimize_last_semester,
+            )
+            _in_flight[inputs_hash] = future
+            future.add_done_callback(lambda _f: _forget(inputs_hash))
+
+        _jobs[job_id] = (plan_id, inputs, inputs_hash, future)
+        if len(_jobs) > _JOBS_MAX:
+            _jobs.popitem(last=False)
+    return job_id
+
+
+def _forget(inputs_hash: str) -> None:
+    with _lock:
+        _in_flight.pop(inputs_hash, None)
+
+
+def get_job(job_id: str) -> Optional[Tuple[int, Dict, str, Future]]:
+    return _jobs.get(job_id)
+
+
+def discard_job(job_id: str) -> None:
+    with _lock:
+        _jobs.pop(job_id, None)
@@ -1,9 +1,22 @@
-from typing import Dict, List
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Tuple
+
 from pulp import (
+    HiGHS,
+    LpAffineExpression,
+    LpConstraint,
+    LpConstraintEQ,
+    LpConstraintGE,
+    LpConstraintLE,
     LpProblem,
     LpMinimize,
     LpVariable,
-    lpSum,
+    LpSolutionIntegerFeasible,
+    LpSolutionOptimal,
     LpStatus,
     PULP_CBC_CMD,
 )
@@ -35,50 +48,205 @@ def build_model(
         for s in allowed_semesters[c]:
             x[c][s] = LpVariable(f"x_{c}_{s}", lowBound=0, upBound=1, cat="Binary")
 
-    # helper: "semester of course c" as linear expression
-    def sem_expr(c: str):
-        return lpSum(s * x[c][s] for s in allowed_semesters[c])
+    # Expressions are built straight from (var, coef) terms and constraints as LpConstraint
+    # with a numeric rhs: lpSum / `expr == 1` / `a <= b` each allocate extra
+    # intermediate LpAffineExpression copies per term or per constraint.
+
+    # helper: (var, semester) terms of "semester of course c"
+    def sem_terms(c: str):
+        return [(var, s) for s, var in x[c].items()]
 
     # 1) always: each course exactly once
     for c in courses:
-        model += lpSum(x[c][s] for s in allowed_semesters[c]) == 1, f"one_sem_{c}"
-
-    semesters = sorted({s for sems in allowed_semesters.values() for s in sems})
+        model += LpConstraint(
+            LpAffineExpression((var, 1) for var in x[c].values()),
+            LpConstraintEQ,
+            name=f"one_sem_{c}",
+            rhs=1,
+        )
 
     # 2) optional: CREDIT LIMITS
     if use_credit_limits:
-        for s in semesters:
-            model += (
-                lpSum(
-                    credits[c] * x[c][s]
-                    for c in courses
-                    if s in allowed_semesters[c]
-                )
-                <= max_credits_per_semester.get(s, 9999)
-            ), f"max_credits_sem_{s}"
+        # one pass over the vars, bucketed by semester
+        credit_terms: Dict[int, list] = defaultdict(list)
+        for c in courses:
+            for s, var in x[c].items():
+                credit_terms[s].append((var, credits[c]))
+
+        for s in sorted(credit_terms):
+            model += LpConstraint(
+                LpAffineExpression(credit_terms[s]),
+                LpConstraintLE,
+                name=f"max_credits_sem_{s}",
+                rhs=max_credits_per_semester.get(s, 9999),
+            )
 
     # 3) optional: PREREQS
+    # sem(c) - sem(p) >= 1   (p and c are different courses, so their vars never overlap)
     if use_prereqs:
         for c in courses:
             for p in prereqs.get(c, []):
-                model += sem_expr(p) + 1 <= sem_expr(c), f"prereq_{p}_before_{c}"
+                model += LpConstraint(
+                    LpAffineExpression(sem_terms(c) + [(var, -s) for s, var in x[p].items()]),
+                    LpConstraintGE,
+                    name=f"prereq_{p}_before_{c}",
+                    rhs=1,
+                )
 
     # 4) objective
     if minimize_last_semester:
-        # minimize the latest semester used
+        # minimize the latest semester used: sem(c) - last_sem <= 0 for every course
         last_sem = LpVariable("last_sem", lowBound=1, cat="Integer")
         for c in courses:
-            model += sem_expr(c) <= last_sem, f"last_sem_after_{c}"
+            model += LpConstraint(
+                LpAffineExpression(sem_terms(c) + [(last_sem, -1)]),
+                LpConstraintLE,
+                name=f"last_sem_after_{c}",
+                rhs=0,
+            )
         model += last_sem, "minimize_last_semester"
     else:
         # simple "earlier is better" objective
-        model += lpSum(
-            s * x[c][s] for c in courses for s in allowed_semesters[c]
+        model += LpAffineExpression(
+            (var, s) for c in courses for s, var in x[c].items()
         ), "minimize_sum_semesters"
 
     return model, x
 
 
+# Solver settings for the web path: quiet, all cores, and a hard cap so a hard plan
+# can't hold a request (and a worker) forever.
+_SOLVER_THREADS = os.cpu_count() or 1
+_SOLVER_TIME_LIMIT_S = 30
+
+_web_solver = None
+
+
+def _get_web_solver():
+    """
+    HiGHS through highspy (in-process, no model file / subprocess) when it's installed,
+    otherwise the CBC binary bundled with PuLP. Chosen once per process.
+    """
+    global _web_solver
+    if _web_solver is None:
+        highs = HiGHS(msg=False, threads=_SOLVER_THREADS, timeLimit=_SOLVER_TIME_LIMIT_S)
+        if highs.available():
+            _web_solver = highs
+        else:
+            _web_solver = PULP_CBC_CMD(
+                msg=0, threads=_SOLVER_THREADS, timeLimit=_SOLVER_TIME_LIMIT_S
+            )
+    return _web_solver
+
+
+# Bounded LRU of solved schedules, keyed on the solver inputs themselves (+ flags).
+# Content-addressed, so any edit to courses/offerings/prereqs/settings is simply a new key;
+# re-solving an unchanged plan skips model assembly and the solver run.
+# Only proven outcomes are kept: a time-limited result may improve on the next run.
+# Shared by the solve_jobs worker threads, hence the lock (never held while solving).
+_SOLVE_CACHE_MAX = 32
+_solved: OrderedDict[tuple, Tuple[str, int, Dict[str, int]]] = OrderedDict()
+_solved_lock = threading.Lock()
+
+# statuses that won't change by solving the same inputs again
+PROVEN_STATUSES = ("Optimal", "Infeasible")
+
+
+def _inputs_key(inputs: Dict, flags: Tuple[bool, bool, bool]) -> tuple:
+    return (
+        tuple(inputs["courses"]),
+        tuple((c, tuple(p)) for c, p in inputs["prereqs"].items()),
+        tuple((c, tuple(s)) for c, s in inputs["allowed_semesters"].items()),
+        tuple(inputs["credits"].items()),
+        tuple(inputs["max_credits_per_semester"].items()),
+        flags,
+    )
+
+
+def inputs_digest(
+    inputs: Dict,
+    *,
+    use_credit_limits: bool,
+    use_prereqs: bool,
+    minimize_last_semester: bool,
+) -> str:
+    """
+    Stable fingerprint of the solver inputs + flags (hex, 32 chars), for caching
+    results outside this process (see models.plan_solution.PlanSolution).
+    """
+    key = _inputs_key(inputs, (use_credit_limits, use_prereqs, minimize_last_semester))
+    raw = json.dumps(key, separators=(",", ":")).encode("utf-8")
+    # bump the version when the meaning of stored results changes (v2: status from
+    # sol_status), so rows saved under the old rules stop matching and get re-solved
+    return hashlib.blake2b(raw, digest_size=16, person=b"plansol-v2").hexdigest()
+
+
+def solve_schedule(
+    inputs: Dict,
+    *,
+    use_credit_limits: bool,
+    use_prereqs: bool,
+    minimize_last_semester: bool,
+) -> Tuple[str, int, Dict[str, int]]:
+    """
+    Build + solve the model for build_inputs_from_plan(...) output.
+    Returns (status, model.sol_status, {course_code: chosen semester}).
+
+    status is "Optimal" only for a proven optimum and "Feasible" for a schedule the
+    solver stopped on (time limit) before proving it; otherwise the LpStatus string
+    ("Infeasible", "Not Solved", ...) and the mapping is empty.
+    """
+    key = _inputs_key(inputs, (use_credit_limits, use_prereqs, minimize_last_semester))
+    with _solved_lock:
+        cached = _solved.get(key)
+        if cached is not None:
+            _solved.move_to_end(key)
+    if cached is not None:
+        return cached[0], cached[1], dict(cached[2])
+
+    model, x = build_model(
+        inputs["courses"],
+        inputs["prereqs"],
+        inputs["allowed_semesters"],
+        inputs["credits"],
+        inputs["max_credits_per_semester"],
+        use_credit_limits=use_credit_limits,
+        use_prereqs=use_prereqs,
+        minimize_last_semester=minimize_last_semester,
+    )
+    model.solve(_get_web_solver())
+
+    # model.status alone can't be trusted after the time limit: HiGHS reports a stopped
+    # run as Optimal and CBC as Not Solved; sol_status says what the values really are.
+    sol_status = model.sol_status
+    if sol_status == LpSolutionOptimal:
+        status = "Optimal"
+    elif sol_status == LpSolutionIntegerFeasible:
+        status = "Feasible"
+    else:
+        status = LpStatus[model.status]
+        if status == "Optimal":
+            # stopped without any incumbent
+            status = "Not Solved"
+
+    chosen: Dict[str, int] = {}
+    if status in ("Optimal", "Feasible"):
+        # one pass over the per-course var dicts; stop at the first semester set to 1
+        for c, vars_by_sem in x.items():
+            for s, var in vars_by_sem.items():
+                val = var.varValue
+                if val is not None and val > 0.5:
+                    chosen[c] = s
+                    break
+
+    if status in PROVEN_STATUSES:
+        with _solved_lock:
+            _solved[key] = (status, sol_status, chosen)
+            if len(_solved) > _SOLVE_CACHE_MAX:
+                _solved.popitem(last=False)
+    return status, sol_status, dict(chosen)
+
+
 
 def build_inputs_from_plan(plan_id: int) -> Dict:
     """
@@ -91,16 +259,23 @@ def build_inputs_from_plan(plan_id: int) -> Dict:
         - allowed_semesters: Dict[str, List[int]]
         - credits: Dict[str, int]
         - max_credits_per_semester: Dict[int, int]
+        - course_info: Dict[str, Tuple[str, int | None]]   # code -> (name, difficulty), display only
     """
     # Lazy imports to avoid circular imports with app/__init__
     from models.degree_plan import DegreePlan
     from models.course import Course
-    from models.course_offering import CourseOffering
     from models.prerequisite import Prerequisite
     from models.plan_constraint import PlanConstraint
+    from extensions import db
+    from sqlalchemy import select
+    from sqlalchemy.orm import joinedload
 
     # 1) Get the plan (service layer → use .get + ValueError, not get_or_404)
-    plan = DegreePlan.query.get(plan_id)
+    plan = db.session.get(
+        DegreePlan,
+        plan_id,
+        options=[joinedload(DegreePlan.constraints)],
+    )
     if plan is None:
         raise ValueError(f"DegreePlan with id={plan_id} not found")
 
@@ -120,9 +295,7 @@ def build_inputs_from_plan(plan_id: int) -> Dict:
     credits: Dict[str, int] = {c.code: c.credits for c in course_rows}
 
     # 3) Plan constraints: total_semesters + global max_credits_per_semester
-    constraints: PlanConstraint | None = PlanConstraint.query.filter_by(
-        degree_plan_id=plan.id
-    ).first()
+    constraints: PlanConstraint | None = plan.constraints
 
     if constraints and constraints.total_semesters:
         total_semesters = constraints.total_semesters
@@ -141,35 +314,26 @@ def build_inputs_from_plan(plan_id: int) -> Dict:
         s: default_max_credits for s in range(1, total_semesters + 1)
     }
 
-    # 4) Allowed semesters from CourseOffering
-    #
-    # CourseOffering has:
-    #    course_id
-    #    semester_number
-    #
-    # Each Course row has .offerings backref (because of the relationship).
-    allowed_semesters: Dict[str, List[int]] = {c.code: [] for c in course_rows}
-
-    for c in course_rows:
-        for off in c.offerings:
-            # Just trust the semester_number as given
-            allowed_semesters[c.code].append(off.semester_number)
-
-    # No offerings
-    # Sort & deduplicate for sanity
-    for code in allowed_semesters:
-        allowed_semesters[code] = sorted(set(allowed_semesters[code]))
+    # 4) Allowed semesters from each course's offerings bitmask
+    # (already on the rows loaded above, decoded in ascending order)
+    allowed_semesters: Dict[str, List[int]] = {
+        c.code: c.offered_semesters for c in course_rows
+    }
 
     # 5) Prereqs from Prerequisite table
-    prereq_rows: List[Prerequisite] = Prerequisite.query.filter_by(
-        degree_plan_id=plan.id
-    ).all()
+    # Only the two id columns are needed: fetch plain tuples, no ORM objects per edge.
+    # Streamed in batches so peak memory is O(batch), not O(edges), on large plans.
+    prereq_rows = db.session.execute(
+        select(Prerequisite.course_id, Prerequisite.prereq_course_id)
+        .where(Prerequisite.degree_plan_id == plan.id)
+        .execution_options(yield_per=1000)
+    )
 
     prereqs: Dict[str, List[str]] = {c.code: [] for c in course_rows}
 
-    for row in prereq_rows:
-        course_code = code_by_id.get(row.course_id)
-        prereq_code = code_by_id.get(row.prereq_course_id)
+    for course_id, prereq_course_id in prereq_rows:
+        course_code = code_by_id.get(course_id)
+        prereq_code = code_by_id.get(prereq_course_id)
         if course_code is None or prereq_code is None:
             # Either FK points to a course in a different plan or missing – skip
             continue
@@ -181,6 +345,8 @@ def build_inputs_from_plan(plan_id: int) -> Dict:
         "allowed_semesters": allowed_semesters,
         "credits": credits,
         "max_credits_per_semester": max_credits_per_semester,
+        # for the schedule page, from the same course rows; not part of the solver key
+        "course_info": {c.code: (c.name, c.difficulty) for c in course_rows},
     }
 
 
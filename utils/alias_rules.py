@@ -3,7 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 import csv
-import io 
+
+from utils.file_lines import iter_text_lines
 
 @dataclass(frozen=True)
 class AliasRules:
@@ -25,34 +26,25 @@ def load_aliases_csv(path: str) -> AliasRules:
     if not p.exists():
         return AliasRules(alias_to_canonical=mapping)
 
-    # Read and pre-filter lines so DictReader sees a real header row.
-    raw_lines = p.read_text(encoding="utf-8").splitlines()
-    cleaned_lines: list[str] = []
-    for line in raw_lines:
-        s = line.strip()
-        if not s:
-            continue
-        if s.startswith("#"):
-            continue
-        cleaned_lines.append(line)
+    # Pre-filter lines so DictReader sees a real header row.
+    cleaned_lines = (
+        line for line in iter_text_lines(p)
+        if line.strip() and not line.strip().startswith("#")
+    )
 
-    if not cleaned_lines:
-        return AliasRules(alias_to_canonical=mapping)
+    reader = csv.DictReader(cleaned_lines)
 
-    with io.StringIO("\n".join(cleaned_lines)) as f:
-        reader = csv.DictReader(f)
-
-        # Normalize fieldnames (strip whitespace, lower-case)
-        if reader.fieldnames:
-            reader.fieldnames = [fn.strip().lower() for fn in reader.fieldnames]
-
-        for row in reader:
-            if not row:
-                continue
-            alias = (row.get("alias") or "").strip()
-            canonical = (row.get("canonical") or "").strip()
-            if not alias or not canonical:
-                continue
-            mapping[alias] = canonical
+    # Normalize fieldnames (strip whitespace, lower-case)
+    if reader.fieldnames:
+        reader.fieldnames = [fn.strip().lower() for fn in reader.fieldnames]
+
+    for row in reader:
+        if not row:
+            continue
+        alias = (row.get("alias") or "").strip()
+        canonical = (row.get("canonical") or "").strip()
+        if not alias or not canonical:
+            continue
+        mapping[alias] = canonical
 
     return AliasRules(alias_to_canonical=mapping)
\ No newline at end of file
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-import csv
 import re
 import pandas as pd
+from openpyxl import load_workbook
 
 from utils.external_rules import ExternalRules
 from utils.alias_rules import AliasRules
@@ -36,11 +36,38 @@ def normalize_name_key(s: str) -> str:
     return s
 
 
+# directory -> (file signature, parsed catalog). Catalog files change a few times a
+# semester, so every worker re-parses only when a file is added/removed/modified.
+_catalog_cache: dict[str, tuple[tuple, list[CatalogCourse]]] = {}
+
+
+def _catalog_signature(p: Path) -> tuple:
+    files = [*p.glob("*.xlsx"), *p.glob("*.csv")]
+    sig = []
+    for f in files:
+        st = f.stat()
+        sig.append((f.name, st.st_mtime_ns, st.st_size))
+    return tuple(sorted(sig))
+
+
 def load_catalog(directory: str) -> list[CatalogCourse]:
     p = Path(directory)
     if not p.exists() or not p.is_dir():
         return []
 
+    key = str(p.resolve())
+    sig = _catalog_signature(p)
+    cached = _catalog_cache.get(key)
+    if cached is not None and cached[0] == sig:
+        # CatalogCourse is frozen; only the list itself needs copying
+        return list(cached[1])
+
+    out = _load_catalog_files(p)
+    _catalog_cache[key] = (sig, out)
+    return list(out)
+
+
+def _load_catalog_files(p: Path) -> list[CatalogCourse]:
     items: list[CatalogCourse] = []
 
     # Load Excel files
@@ -65,74 +92,106 @@ def load_catalog(directory: str) -> list[CatalogCourse]:
     return out
 
 
-def _load_csv_catalog(f: Path) -> list[CatalogCourse]:
-    items: list[CatalogCourse] = []
-    with f.open(newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            code = (row.get("code") or row.get("Code") or "").strip()
-            name = (row.get("name") or row.get("Name") or "").strip()
-            credits_raw = (row.get("credits") or row.get("Credits") or "").strip()
+_CSV_COLUMNS = ("code", "name", "credits")
 
-            if not code or not name:
-                continue
 
-            credits = None
-            if credits_raw:
-                try:
-                    credits = int(float(credits_raw))
-                except ValueError:
-                    credits = None
-
-            items.append(CatalogCourse(code=code, name=name, credits=credits))
-    return items
+def _load_csv_catalog(f: Path) -> list[CatalogCourse]:
+    # Typed, column-pruned read in pandas' C parser instead of a csv.DictReader loop.
+    # Header matching stays case-insensitive ("code" / "Code").
+    df = pd.read_csv(
+        f,
+        dtype="string",
+        encoding="utf-8",
+        engine="c",
+        keep_default_na=False,
+        usecols=lambda col: col.strip().lower() in _CSV_COLUMNS,
+    )
+    df.columns = [col.strip().lower() for col in df.columns]
+    if "code" not in df.columns or "name" not in df.columns:
+        return []
 
+    codes = df["code"].str.strip()
+    names = df["name"].str.strip()
+    if "credits" in df.columns:
+        credits_col = pd.to_numeric(df["credits"].str.strip(), errors="coerce")
+    else:
+        credits_col = pd.Series(float("nan"), index=df.index)
 
-def _load_xlsx_catalog(f: Path) -> list[CatalogCourse]:
-    df = pd.read_excel(f)
     items: list[CatalogCourse] = []
+    for code, name, credits_val in zip(codes, names, credits_col):
+        if not code or not name:
+            continue
 
-    def norm(v) -> str:
-        return normalize_name_key(v)
-
-    def get_text(r, col: str) -> str | None:
-        v = r.get(col)
-        if v is None or (isinstance(v, float) and pd.isna(v)):
-            return None
-        s = norm(v)
-        return s if s else None
+        credits = None if pd.isna(credits_val) else int(credits_val)
+        items.append(CatalogCourse(code=code, name=name, credits=credits))
+    return items
 
-    def get_int(r, col: str) -> int | None:
-        v = r.get(col)
-        if v is None or (isinstance(v, float) and pd.isna(v)):
-            return None
-        try:
-            return int(float(v))
-        except Exception:
-            return None
 
-    for _, r in df.iterrows():
-        code = norm(r.get("מס.שעור"))
-        name = norm(r.get("שם השיעור"))
+def _load_xlsx_catalog(f: Path) -> list[CatalogCourse]:
+    # Read-only + values_only streams plain tuples instead of building a Cell per value
+    wb = load_workbook(f, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]  # same sheet pd.read_excel picked by default
+        rows = ws.iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return []
+        col_idx: dict[str, int] = {}
+        for i, h in enumerate(header):
+            if h is not None:
+                col_idx.setdefault(str(h), i)
+
+        def cell(r: tuple, col: str):
+            i = col_idx.get(col)
+            if i is None or i >= len(r):
+                return None
+            return r[i]
+
+        def norm(v) -> str:
+            return normalize_name_key(v)
+
+        def get_text(r: tuple, col: str) -> str | None:
+            v = cell(r, col)
+            if v is None:
+                return None
+            s = norm(v)
+            return s if s else None
+
+        def get_int(r: tuple, col: str) -> int | None:
+            v = cell(r, col)
+            if v is None:
+                return None
+            try:
+                return int(float(v))
+            except Exception:
+                return None
+
+        items: list[CatalogCourse] = []
+        for r in rows:
+            code = norm(cell(r, "מס.שעור"))
+            name = norm(cell(r, "שם השיעור"))
 
-        if not code or not name:
-            continue
+            if not code or not name:
+                continue
 
-        items.append(
-            CatalogCourse(
-                code=code,
-                name=name,
-                credits=get_int(r, "נ.זיכוי"),
-                prereq_text=get_text(r, "תיאור ד.קדם"),
-                coreq_text=get_text(r, "תיאור ד.מקבילה"),
-                study_year=get_int(r, "שנת לימודים"),
-                instructor_name=get_text(r, "שם המרצה"),
-                weekly_hours=get_int(r, 'ש"ש'),
-                course_type=get_text(r, "סוג שיעור"),
+            items.append(
+                CatalogCourse(
+                    code=code,
+                    name=name,
+                    credits=get_int(r, "נ.זיכוי"),
+                    prereq_text=get_text(r, "תיאור ד.קדם"),
+                    coreq_text=get_text(r, "תיאור ד.מקבילה"),
+                    study_year=get_int(r, "שנת לימודים"),
+                    instructor_name=get_text(r, "שם המרצה"),
+                    weekly_hours=get_int(r, 'ש"ש'),
+                    course_type=get_text(r, "סוג שיעור"),
+                )
             )
-        )
 
-    return items
+        return items
+    finally:
+        wb.close()
 
 
 def build_catalog_maps(courses: list[CatalogCourse]):
@@ -207,4 +266,6 @@ def is_external_token(token: str, rules: ExternalRules) -> bool:
     t = normalize_name_key(token)
     if t in rules.exact:
         return True
+    if rules.combined is not None:
+        return rules.combined.search(t) is not None
     return any(rx.search(t) for rx in rules.patterns)
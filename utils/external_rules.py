@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from pathlib import Path
 import re
 
+from utils.file_lines import iter_text_lines
+
 
 @dataclass(frozen=True)
 class ExternalRules:
@@ -16,6 +18,25 @@ class ExternalRules:
     exact: set[str]
     patterns: list[re.Pattern[str]]
 
+    # All patterns fused into one alternation (one regex scan per token instead of one per rule).
+    # None when the patterns can't be safely combined; callers fall back to `patterns`.
+    combined: re.Pattern[str] | None = None
+
+
+def _combine_patterns(patterns: list[re.Pattern[str]]) -> re.Pattern[str] | None:
+    if not patterns:
+        return None
+
+    # Numbered backreferences would shift once groups from earlier rules are in front of them
+    if any(p.groups and re.search(r"\\[1-9]", p.pattern) for p in patterns):
+        return None
+
+    try:
+        return re.compile("|".join(f"(?:{p.pattern})" for p in patterns))
+    except re.error:
+        # e.g. inline global flags like (?i) that are only valid at the start of a pattern
+        return None
+
 
 def load_external_rules(path: str) -> ExternalRules:
     """Load external classification rules from a text file.
@@ -35,7 +56,7 @@ def load_external_rules(path: str) -> ExternalRules:
     if not p.exists():
         return ExternalRules(exact=exact, patterns=patterns)
 
-    for raw_line in p.read_text(encoding="utf-8").splitlines():
+    for raw_line in iter_text_lines(p):
         line = raw_line.strip()
         if not line or line.startswith("#"):
             continue
@@ -52,4 +73,4 @@ def load_external_rules(path: str) -> ExternalRules:
         # Default: treat as regex for convenience.
         patterns.append(re.compile(line))
 
-    return ExternalRules(exact=exact, patterns=patterns)
\ No newline at end of file
+    return ExternalRules(exact=exact, patterns=patterns, combined=_combine_patterns(patterns))
\ No newline at end of file
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+import mmap
+
+
+def iter_text_lines(p: Path, encoding: str = "utf-8") -> Iterator[str]:
+    """Yield the lines of a text file (without line endings) via a read-only mmap.
+
+    Lines are decoded one at a time straight from the mapped pages, so the
+    file is never copied into one big Python str first.
+    """
+    with p.open("rb") as fh:
+        # mmap can't map a zero-length file
+        if p.stat().st_size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b""):
+                yield raw.decode(encoding).rstrip("\r\n")
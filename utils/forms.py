@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import re
+
+
+# Shared form-field parsing for the course routes.
+# Each helper returns (value, error_message); exactly one of them is None
+# (except optional fields, where a blank input gives (None, None)).
+
+
+def form_fields(form, *keys: str) -> tuple[str, ...]:
+    # stripped text of each field, "" when missing; one pass over a form bound once
+    get = form.get
+    return tuple((get(k) or "").strip() for k in keys)
+
+
+# Plain decimal only: float() alone would also take "1e1", "inf", "nan", "1_0"
+_DECIMAL_RE = re.compile(r"-?(?:\d+(?:\.\d*)?|\.\d+)")
+
+
+def parse_credits(raw: str) -> tuple[float | None, str | None]:
+    if not raw:
+        return None, "Credits are required."
+
+    if not _DECIMAL_RE.fullmatch(raw):
+        return None, "Credits must be a number."
+    val = float(raw)
+
+    if val <= 0:
+        return None, "Credits must be positive."
+
+    if not (val * 2).is_integer():
+        return None, "Credits must be an integer OR end with .5"
+
+    return val, None
+
+
+def parse_difficulty(raw: str) -> tuple[int | None, str | None]:
+    # optional: blank means "no difficulty"
+    if not raw:
+        return None, None
+
+    try:
+        val = int(raw)
+    except ValueError:
+        return None, "Difficulty must be a number between 1 and 5."
+
+    if val < 1 or val > 5:
+        return None, "Difficulty must be between 1 and 5."
+
+    return val, None
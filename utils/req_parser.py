@@ -21,13 +21,10 @@ def _is_valid_split_item(node) -> bool:
     if node is None:
         return False
 
-    if isinstance(node, ReqLeaf):
+    if node.IS_LEAF:
         return (node.code is not None) or (node.kind == "external")
 
-    if isinstance(node, (ReqAnd, ReqOr)):
-        return all(_is_valid_split_item(child) for child in node.items)
-
-    return False
+    return all(_is_valid_split_item(child) for child in node.items)
 
 def parse_req_text(text: str, resolve) -> Req | None:
     """
@@ -79,3 +76,18 @@ def dedupe(items: list[Req]) -> list[Req]:
         seen.add(key)
         out.append(it)
     return out
+
+
+def parse_catalog_prereqs(catalog, resolve) -> dict[str, Req | None]:
+    """
+    Parse every distinct catalog prereq_text once and return {prereq_text: tree}.
+
+    Catalogs repeat the same prereq strings across many courses, and the IR is
+    frozen, so courses with identical text can share one tree.
+    """
+    trees: dict[str, Req | None] = {}
+    for c in catalog:
+        text = getattr(c, "prereq_text", None)
+        if text and text not in trees:
+            trees[text] = parse_req_text(text, resolve)
+    return trees